@@ -384,19 +384,23 @@ class ExtractOneVesselPerParentAndSubChildNode(ExtractVesselFromVesselSeedPoints
       startNode = vesselBranchTree.getRootNodeId()
       isStartNodeRoot = True
 
-    for child in vesselBranchTree.getChildrenNodeId(startNode):
-      # Construct startNode + subChildren pairs
+    # Visit (parent, child) pairs depth first in the tree order without recursion
+    stack = [(startNode, child) for child in reversed(vesselBranchTree.getChildrenNodeId(startNode))]
+    while stack:
+      parent, child = stack.pop()
+
+      # Construct parent + subChildren pairs
       subChildren = vesselBranchTree.getChildrenNodeId(child)
       for subChild in subChildren:
-        vesselSeedList.append(VesselSeedPoints(idPositionDict, [startNode, subChild]))
+        vesselSeedList.append(VesselSeedPoints(idPositionDict, [parent, subChild]))
 
       # Special case if starting from root node and current node doesn't have children (to avoid missing the point)
       # otherwise, the node will be contained in a previous parent + subChild pair
-      if len(subChildren) == 0 and isStartNodeRoot:
-        vesselSeedList.append(VesselSeedPoints(idPositionDict, [startNode, child]))
+      if len(subChildren) == 0 and isStartNodeRoot and parent == startNode:
+        vesselSeedList.append(VesselSeedPoints(idPositionDict, [parent, child]))
 
-      # Call recursively for children
-      vesselSeedList += self.parentSubChildBranchPairs(vesselBranchTree, idPositionDict, startNode=child)
+      # Continue with children
+      stack += [(child, subChild) for subChild in reversed(subChildren)]
 
     return vesselSeedList
 
@@ -444,19 +448,24 @@ class ExtractOneVesselPerBranch(ExtractVesselFromVesselSeedPointsStrategy):
     if startNode is None:
       startNode = vesselBranchTree.getRootNodeId()
 
-    for child in vesselBranchTree.getChildrenNodeId(startNode):
+    # Visit (branch start, child) pairs depth first in the tree order without recursion
+    stack = [(startNode, child) for child in reversed(vesselBranchTree.getChildrenNodeId(startNode))]
+    while stack:
+      branchStart, child = stack.pop()
       seedPoints = VesselSeedPoints(idPositionDict)
-      seedPoints.appendPoint(startNode)
+      seedPoints.appendPoint(branchStart)
       seedPoints.appendPoint(child)
 
       # Append children until child reaches leaf or a child with more than one sub child
       subChild = child
-      while len(vesselBranchTree.getChildrenNodeId(subChild)) == 1:
-        subChild = vesselBranchTree.getChildrenNodeId(subChild)[0]
+      subChildren = vesselBranchTree.getChildrenNodeId(subChild)
+      while len(subChildren) == 1:
+        subChild = subChildren[0]
         seedPoints.appendPoint(subChild)
+        subChildren = vesselBranchTree.getChildrenNodeId(subChild)
 
-      # Call recursively for reached leafs
+      # Continue with the branches starting at reached node
       vesselSeedList.append(seedPoints)
-      vesselSeedList += self.constructBranchFromRoot(vesselBranchTree, idPositionDict, startNode=subChild)
+      stack += [(subChild, nextChild) for nextChild in reversed(subChildren)]
 
     return vesselSeedList
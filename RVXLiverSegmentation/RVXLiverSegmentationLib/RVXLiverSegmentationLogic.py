@@ -199,7 +199,9 @@ class RVXLiverSegmentationLogic(ScriptedLoadableModuleLogic, IRVXLiverSegmentati
 
     # Normalize output between 0 and 1
     output_array = itk.array_view_from_image(filtered_image)
-    output_array = (output_array - np.min(output_array)) / (np.max(output_array) - np.min(output_array))
+    minValue, maxValue = output_array.min(), output_array.max()
+    output_array = output_array - minValue
+    output_array /= (maxValue - minValue)
 
     # Initialize output volume from input volume
     vesselnessFiltered = createVolumeNodeBasedOnModel(sourceVolume, "VesselnessFiltered", "vtkMRMLScalarVolumeNode")
@@ -423,16 +425,44 @@ class RVXLiverSegmentationLogic(ScriptedLoadableModuleLogic, IRVXLiverSegmentati
     raiseValueErrorIfInvalidType(levelSetSegmentationModel=(levelSetSegmentationModel, "vtkMRMLModelNode"),
                                  endPoint=(endPoints, "vtkMRMLMarkupsFiducialNode"))
 
-    # Create output node
-    centerLineModel = createModelNode("CenterLineModel")
+    logic = VMTKModule.getCenterlineExtractionLogic()
+    inputSurfacePolyData = logic.polyDataFromNode(levelSetSegmentationModel, None)
+    return RVXLiverSegmentationLogic._centerLineFilterFromSurface(logic, inputSurfacePolyData, endPoints)
+
+  @staticmethod
+  def centerLineFilterFromPolyData(surfacePolyData, endPoints):
+    """
+    Extracts center line from input vessel surface poly data and end points. Avoids adding a model node to the scene
+    when the vessel surface is not needed in the scene.
+
+    Parameters
+    ----------
+    surfacePolyData : vtkPolyData
+      Outer vessel mesh
+    endPoints : vtkMRMLMarkupsFiducialNode
+      End points for the vessel
+
+    Returns
+    -------
+    centerLineModel : vtkMRMLModelNode
+      Contains center line vtkPolyData extracted from input vessel surface
+    """
+    # Type checking
+    raiseValueErrorIfInvalidType(surfacePolyData=(surfacePolyData, vtk.vtkPolyData),
+                                 endPoint=(endPoints, "vtkMRMLMarkupsFiducialNode"))
 
     logic = VMTKModule.getCenterlineExtractionLogic()
+    return RVXLiverSegmentationLogic._centerLineFilterFromSurface(logic, surfacePolyData, endPoints)
+
+  @staticmethod
+  def _centerLineFilterFromSurface(logic, inputSurfacePolyData, endPoints):
+    # Create output node
+    centerLineModel = createModelNode("CenterLineModel")
 
     # Preprocess poly data
     targetNumberOfPoints = 5000
     decimationAggressiveness = 4.0
     subdivideInputSurface = False
-    inputSurfacePolyData = logic.polyDataFromNode(levelSetSegmentationModel, None)
     preprocessedPolyData = logic.preprocess(inputSurfacePolyData, targetNumberOfPoints, decimationAggressiveness,
                                             subdivideInputSurface)
 
@@ -448,7 +478,7 @@ class RVXLiverSegmentationLogic(ScriptedLoadableModuleLogic, IRVXLiverSegmentati
 
     Parameters
     ----------
-    levelSetSegmentationModel : vtkMRMLModelNode
+    levelSetSegmentationModel : vtkMRMLModelNode or vtkPolyData
       Result from LevelSetSegmentation representing outer vessel mesh
     startPoints : List[list[float]]
       Start position for the vessel
@@ -464,7 +494,10 @@ class RVXLiverSegmentationLogic(ScriptedLoadableModuleLogic, IRVXLiverSegmentati
     endPoints = createFiducialNode("endPoint", *(startPoints + endPoints))
 
     # Call centerline extraction
-    centerLineModel = RVXLiverSegmentationLogic.centerLineFilter(levelSetSegmentationModel, endPoints)
+    if isinstance(levelSetSegmentationModel, vtk.vtkPolyData):
+      centerLineModel = RVXLiverSegmentationLogic.centerLineFilterFromPolyData(levelSetSegmentationModel, endPoints)
+    else:
+      centerLineModel = RVXLiverSegmentationLogic.centerLineFilter(levelSetSegmentationModel, endPoints)
 
     # remove end point from slicer
     removeNodeFromMRMLScene(endPoints)
@@ -472,6 +505,36 @@ class RVXLiverSegmentationLogic(ScriptedLoadableModuleLogic, IRVXLiverSegmentati
     # Return centerLineModel
     return centerLineModel
 
+  @staticmethod
+  def resampleCenterLine(centerLineModel, length):
+    """Resamples the center line poly lines to the input spacing. Equivalent to vmtkcenterlineresampling which relies on
+    a spline filter. The center line is left unchanged if it is empty, if length is not positive or if resampling
+    doesn't reduce its number of points.
+
+    Parameters
+    ----------
+    centerLineModel : vtkMRMLModelNode
+      Model containing the center line vtkPolyData
+    length : float
+      Target distance between two consecutive center line points
+    """
+    centerLinePolyData = centerLineModel.GetPolyData()
+    if centerLinePolyData is None or centerLinePolyData.GetNumberOfPoints() == 0 or length <= 0:
+      return
+
+    cleaner = vtk.vtkCleanPolyData()
+    cleaner.SetInputData(centerLinePolyData)
+
+    splineFilter = vtk.vtkSplineFilter()
+    splineFilter.SetInputConnection(cleaner.GetOutputPort())
+    splineFilter.SetSubdivideToLength()
+    splineFilter.SetLength(length)
+    splineFilter.Update()
+
+    resampledPolyData = splineFilter.GetOutput()
+    if 0 < resampledPolyData.GetNumberOfPoints() < centerLinePolyData.GetNumberOfPoints():
+      centerLineModel.SetAndObservePolyData(resampledPolyData)
+
   @staticmethod
   def _isPointValid(point):
     return (point is not None) and (isinstance(point, slicer.vtkMRMLMarkupsFiducialNode)) and (
@@ -1,4 +1,4 @@
-from itertools import count
+from contextlib import contextmanager
 import logging
 import os
 from pathlib import Path
@@ -9,6 +9,8 @@ import qt
 import slicer
 import vtk
 
+logger = logging.getLogger("RVesselX")
+
 
 class Icons(object):
   """ Object responsible for the different icons in the module. The module doesn't have any icons internally but pulls
@@ -33,7 +35,8 @@ class WidgetUtils(object):
     if not hasattr(widget, "children"):
       return []
     else:
-      return [child for child in widget.children() if childString.lower() in child.name.lower()]
+      childString = childString.lower()
+      return [child for child in widget.children() if childString in child.name.lower()]
 
   @staticmethod
   def getFirstChildContainingName(widget, childString):
@@ -55,7 +58,7 @@ class WidgetUtils(object):
   @staticmethod
   def hideChildrenContainingName(widget, childString):
     hiddenChildren = WidgetUtils.getChildrenContainingName(widget, childString)
-    for child in WidgetUtils.getChildrenContainingName(widget, childString):
+    for child in hiddenChildren:
       child.visible = False
     return hiddenChildren
 
@@ -71,17 +74,26 @@ class Settings(object):
   """Helper class to get and set settings in Slicer with RVesselX tag
   """
 
+  # Slicer application settings shared by all the accesses
+  _appSettings = None
+
+  @staticmethod
+  def _settings():
+    if Settings._appSettings is None:
+      Settings._appSettings = slicer.app.settings()
+    return Settings._appSettings
+
   @staticmethod
   def _withPrefix(key):
     return "RVesselX/" + key
 
   @staticmethod
   def value(key, defaultValue=None):
-    return slicer.app.settings().value(Settings._withPrefix(key), defaultValue)
+    return Settings._settings().value(Settings._withPrefix(key), defaultValue)
 
   @staticmethod
   def setValue(key, value):
-    slicer.app.settings().setValue(Settings._withPrefix(key), value)
+    Settings._settings().setValue(Settings._withPrefix(key), value)
 
   @staticmethod
   def _exportDirectoryKey():
@@ -100,6 +112,13 @@ class GeometryExporter(object):
   """Helper object to export mrml types to given output directory
   """
 
+  # Supported node types and their export extension
+  _typeExtensions = ((slicer.vtkMRMLVolumeNode, ".nii.gz"), (slicer.vtkMRMLModelNode, ".vtp"),
+                     (slicer.vtkMRMLMarkupsFiducialNode, ".fcsv"))
+
+  # Export extension resolved for each concrete node class
+  _classExtensions = {}
+
   def __init__(self, **elementsToExport):
     """Class can be instantiated with dictionary of elements to export. Key represents the export name of the element and
     value the slicer MRML Node to export
@@ -108,7 +127,10 @@ class GeometryExporter(object):
     ----------
     elementsToExport: keyword args of elements to export
     """
-    self._elementsToExport = elementsToExport
+    self._elementsToExport = {}
+    self._exportExtensions = {}
+    for elementName, elementNode in elementsToExport.items():
+      self[elementName] = elementNode
 
   def exportToDirectory(self, selectedDir):
     """Export all stored elements to selected directory.
@@ -117,20 +139,25 @@ class GeometryExporter(object):
     ----------
     selectedDir: str. Path to export directory
     """
-    for elementName, elementNode in self._elementsToExport.items():
-      # Select format depending on node type
-      formatExtension = self._elementExportExtension(elementNode)
-
-      if formatExtension is not None:
-        outputPath = os.path.join(selectedDir, elementName + formatExtension)
-        exportSuccessful = slicer.util.saveNode(elementNode, outputPath)
-        if not exportSuccessful:
-          logging.warn("Failed to export file : %s at location %s" % (elementName, outputPath))
+    # Resolve all the output paths before writing. Writing goes through the MRML storage nodes and has to stay on the
+    # main thread.
+    for elementName, elementNode, outputPath in self._exportJobs(selectedDir):
+      exportSuccessful = slicer.util.saveNode(elementNode, outputPath)
+      if not exportSuccessful:
+        logger.warning("Failed to export file : %s at location %s", elementName, outputPath)
+
+  def _exportJobs(self, selectedDir):
+    """Returns the list of (name, node, output path) for every stored element with a supported export format.
+    """
+    directoryPrefix = os.path.join(selectedDir, "")
+    return [(elementName, elementNode, directoryPrefix + elementName + self._exportExtensions[elementName])
+            for elementName, elementNode in self._elementsToExport.items()
+            if self._exportExtensions[elementName] is not None]
 
-  @staticmethod
-  def _elementExportExtension(elementNode):
-    """Extracts export extension for input node given its class. Volumes will be exported as NIFTI files, Models as VTK
-    files. Other nodes are not supported and function will return None.
+  @classmethod
+  def _elementExportExtension(cls, elementNode):
+    """Extracts export extension for input node given its class. Volumes will be exported as compressed NIFTI files,
+    Models as VTK XML PolyData files. Other nodes are not supported and function will return None.
 
     Parameters
     ----------
@@ -139,17 +166,17 @@ class GeometryExporter(object):
     -------
       str or None
     """
-    typeExtensions = {slicer.vtkMRMLVolumeNode: ".nii", slicer.vtkMRMLModelNode: ".vtk",
-                      slicer.vtkMRMLMarkupsFiducialNode: ".fcsv"}
+    nodeClass = type(elementNode)
+    if nodeClass not in cls._classExtensions:
+      cls._classExtensions[nodeClass] = next(
+        (fileExt for fileType, fileExt in cls._typeExtensions if isinstance(elementNode, fileType)), None)
 
-    for fileType, fileExt in typeExtensions.items():
-      if isinstance(elementNode, fileType):
-        return fileExt
-
-    return None
+    return cls._classExtensions[nodeClass]
 
   def __setitem__(self, key, value):
+    # Select format depending on node type when the element is added
     self._elementsToExport[key] = value
+    self._exportExtensions[key] = self._elementExportExtension(value)
 
   def __getitem__(self, key):
     return self._elementsToExport[key]
@@ -494,8 +521,12 @@ def raiseValueErrorIfInvalidType(**kwargs):
 
   Expected input dictionary : "valueName":(value, "expectedType").
   If value is None or value is not an instance of expectedType, method will raise ValueError with text indicating
-  valueName, value and expected type
+  valueName, value and expected type.
+
+  Type checking is skipped when Python runs with optimizations enabled (-O).
   """
+  if not __debug__:
+    return
 
   for valueName, values in kwargs.items():
     # Get value and expect type from dictionary
@@ -541,22 +572,26 @@ class Signal(object):
   """
 
   def __init__(self, *typeInfo):
-    self._id = count(0, 1)
+    self._nextId = 0
     self._connectDict = {}
+    self._slots = ()
     self._typeInfo = str(typeInfo)
 
   def emit(self, *args, **kwargs):
-    for slot in self._connectDict.values():
+    for slot in self._slots:
       slot(*args, **kwargs)
 
   def connect(self, slot):
-    nextId = next(self._id)
-    self._connectDict[nextId] = slot
-    return nextId
+    connectId = self._nextId
+    self._nextId += 1
+    self._connectDict[connectId] = slot
+    self._slots = tuple(self._connectDict.values())
+    return connectId
 
   def disconnect(self, connectId):
     if connectId in self._connectDict:
       del self._connectDict[connectId]
+      self._slots = tuple(self._connectDict.values())
       return True
     return False
 
@@ -573,7 +608,8 @@ def removeNodeFromMRMLScene(node):
     nodes = list(slicer.mrmlScene.GetNodesByName(node))
     for node in nodes:
       removeNodeFromMRMLScene(node)
-  elif slicer.mrmlScene.IsNodePresent(node):
+  elif node.GetScene() is slicer.mrmlScene:
+    # Scene ownership is stored in the node and avoids scanning the scene node collection
     slicer.mrmlScene.RemoveNode(node)
 
 
@@ -585,8 +621,21 @@ def removeNodesFromMRMLScene(nodesToRemove):
   nodesToRemove: List[vtkMRMLNode] or vtkMRMLNode
     Objects to remove from the scene
   """
-  for node in nodesToRemove:
-    removeNodeFromMRMLScene(node)
+  with mrmlBatchProcessing():
+    for node in nodesToRemove:
+      removeNodeFromMRMLScene(node)
+
+
+@contextmanager
+def mrmlBatchProcessing():
+  """Context manager batching the MRML scene modifications done in its scope. Scene observers are notified only once
+  when leaving the outermost scope.
+  """
+  slicer.mrmlScene.StartState(slicer.vtkMRMLScene.BatchProcessState)
+  try:
+    yield
+  finally:
+    slicer.mrmlScene.EndState(slicer.vtkMRMLScene.BatchProcessState)
 
 
 def cropSourceVolume(sourceVolume, roi):
@@ -2,7 +2,7 @@ import qt
 import slicer
 
 from .RVXLiverSegmentationLogic import RVXLiverSegmentationLogic
-from .RVXLiverSegmentationUtils import WidgetUtils, GeometryExporter, removeNodeFromMRMLScene
+from .RVXLiverSegmentationUtils import WidgetUtils, GeometryExporter, removeNodeFromMRMLScene, removeNodesFromMRMLScene
 from .VerticalLayoutWidget import VerticalLayoutWidget
 
 
@@ -12,6 +12,9 @@ class SegmentWidget(VerticalLayoutWidget):
   Can be configured with named segmentation node and prepared segments
   """
 
+  # Segment editor widgets shared by all the instances
+  _segmentEditorRefs = None
+
   def __init__(self, segmentWidgetName, segmentNodeName, segmentNames=None):
     VerticalLayoutWidget.__init__(self, segmentWidgetName)
 
@@ -19,52 +22,84 @@ class SegmentWidget(VerticalLayoutWidget):
       segmentNames = []
 
     self._inputNode = None
+    self._isMasterVolumeUpdatePending = False
     self._labelMap = None
     self._scalarVolume = None
     self._segmentNode = None
     self._model = None
+    self._geometryExporter = None
+    self._lastExportKey = None
 
-    # Get segmentation UI (segmentation UI contains singletons so only one instance can really exist in Slicer)
-    self._segmentUi = slicer.util.getModuleGui(slicer.modules.segmenteditor).parent
-
-    # Extract segmentation Widget from segmentation UI
-    self._segmentationWidget = WidgetUtils.getFirstChildContainingName(self._segmentUi, "EditorWidget")
-
-    # Extract show 3d button and surface smoothing from segmentation widget
+    # Get segmentation UI, segmentation widget, show 3d button and surface smoothing action
     # by default liver 3D will be shown and surface smoothing disabled on entering the tab
-    self._segmentationShow3dButton = WidgetUtils.getFirstChildContainingName(self._segmentationWidget, "show3d")
-
-    # Extract smoothing button from QMenu attached to show3d button
-    self._segmentationSmooth3d = [action for action in self._segmentationShow3dButton.children()[0].actions()  #
-                                  if "surface" in action.text.lower()][0]
+    self._segmentUi, self._segmentationWidget, self._segmentationShow3dButton, self._segmentationSmooth3d = \
+      self._resolveSegmentEditorRefs()
 
     # Hide segmentation node and master volume node
     self._setNodeSelectorVisible(False)
 
     self._verticalLayout.addWidget(self._segmentUi)
     self._layoutList = []
+    self._isLayoutDirty = False
 
-    # Add segmentation volume for the widget
+    # Segmentation volume for the widget is created on first use
     self._segmentNodeName = segmentNodeName
     self._segmentNames = segmentNames
-    self._setupSegmentNode()
+
+  @staticmethod
+  def _resolveSegmentEditorRefs():
+    """Extracts the segment editor widgets used by the SegmentWidget. Segmentation UI contains singletons so only one
+    instance can really exist in Slicer and the extracted widgets are resolved only once for all instances.
+
+    Returns
+    -------
+      Tuple[segmentUi, segmentationWidget, show3dButton, smooth3dAction]
+    """
+    if SegmentWidget._segmentEditorRefs is None:
+      # Get segmentation UI
+      segmentUi = slicer.util.getModuleGui(slicer.modules.segmenteditor).parent
+
+      # Extract segmentation Widget from segmentation UI
+      segmentationWidget = WidgetUtils.getFirstChildContainingName(segmentUi, "EditorWidget")
+
+      # Extract show 3d button and surface smoothing from segmentation widget
+      show3dButton = WidgetUtils.getFirstChildContainingName(segmentationWidget, "show3d")
+
+      # Extract smoothing button from QMenu attached to show3d button
+      smooth3dAction = next(action for action in show3dButton.children()[0].actions()  #
+                            if "surface" in action.text.lower())
+
+      SegmentWidget._segmentEditorRefs = (segmentUi, segmentationWidget, show3dButton, smooth3dAction)
+
+    return SegmentWidget._segmentEditorRefs
 
   def clear(self):
-    removeNodeFromMRMLScene(self._segmentNode)
-    removeNodeFromMRMLScene(self._labelMap)
-    removeNodeFromMRMLScene(self._scalarVolume)
-    removeNodeFromMRMLScene(self._model)
+    removeNodesFromMRMLScene([self._segmentNode, self._labelMap, self._scalarVolume, self._model])
     self._segmentNode = None
     self._labelMap = None
     self._scalarVolume = None
     self._model = None
-    self._setupSegmentNode()
+    self._geometryExporter = None
+    self._lastExportKey = None
+
+    # Recreate segmentation volume directly if the widget is currently used
+    if self.isVisible():
+      self._setupSegmentNode()
+
+  def _setupSegmentNodeIfNecessary(self):
+    """Creates the segmentation volume of the widget if it wasn't already created.
+    """
+    if self._segmentNode is None:
+      self._setupSegmentNode()
 
   def _setupSegmentNode(self):
     # Add segmentation volume for the widget
     self._segmentNode = slicer.mrmlScene.AddNewNodeByClass('vtkMRMLSegmentationNode')
     self._segmentNode.SetName(self._segmentNodeName)
-    self._segmentationWidget.setSegmentationNode(self._segmentNode)
+
+    # Segmentation UI is shared between the widgets. Only set the segmentation node if the widget is shown
+    if self.isVisible():
+      self._segmentationWidget.setSegmentationNode(self._segmentNode)
 
     # Add as many segments as names in input segmentNames
     self._addSegmentationNodes(self._segmentNames)
@@ -73,15 +108,25 @@ class SegmentWidget(VerticalLayoutWidget):
     self._updateSegmentationMasterVolumeNode()
 
   def _addSegmentationNodes(self, segmentNames):
-    for segmentName in segmentNames:
-      self._segmentNode.GetSegmentation().AddEmptySegment(segmentName)
+    # Batch segment addition to notify the segmentation observers only once
+    segmentation = self._segmentNode.GetSegmentation()
+    wasModifying = segmentation.StartModify()
+    try:
+      for segmentName in segmentNames:
+        segmentation.AddEmptySegment(segmentName)
+    finally:
+      segmentation.EndModify(wasModifying)
 
   def _setNodeSelectorVisible(self, isVisible):
     """Changes visibility for master volume selector and segmentation node selector. Both selectors need to be hidden
     when integrated in the RVesselX plugin but shown otherwise.
+    Segmentation widget is shared with the other modules and is only modified if its visibility state differs.
     """
-    self._segmentationWidget.setSourceVolumeNodeSelectorVisible(isVisible)
-    self._segmentationWidget.setSegmentationNodeSelectorVisible(isVisible)
+    if self._segmentationWidget.sourceVolumeNodeSelectorVisible != isVisible:
+      self._segmentationWidget.setSourceVolumeNodeSelectorVisible(isVisible)
+
+    if self._segmentationWidget.segmentationNodeSelectorVisible != isVisible:
+      self._segmentationWidget.setSegmentationNodeSelectorVisible(isVisible)
 
   def setInputNode(self, node):
     """Modify input to given input node and update segmentation master volume
@@ -99,12 +144,19 @@ class SegmentWidget(VerticalLayoutWidget):
     implementation detail in SegmentationEditor module)
     """
 
-    if self._inputNode:
+    # Update uses the input node at execution time. Skip if an update is already waiting to be executed
+    if self._inputNode and not self._isMasterVolumeUpdatePending:
       def updateMasterVolumeNode():
+        self._isMasterVolumeUpdatePending = False
+        if not self._inputNode:
+          return
+
         self._segmentationWidget.setSourceVolumeNode(self._inputNode)
-        self._segmentNode.SetReferenceImageGeometryParameterFromVolumeNode(self._inputNode)
+        if self._segmentNode is not None:
+          self._segmentNode.SetReferenceImageGeometryParameterFromVolumeNode(self._inputNode)
 
       # Wrap update in QTimer for better reliability on set event (otherwise set can fail somehow)
+      self._isMasterVolumeUpdatePending = True
       qt.QTimer.singleShot(0, updateMasterVolumeNode)
 
   def getGeometryExporters(self):
@@ -115,22 +167,50 @@ class SegmentWidget(VerticalLayoutWidget):
     -------
       GeometryExporter containing liver volume or None
     """
-    segmentName = self._segmentNode.GetName()
+    self._setupSegmentNodeIfNecessary()
+
+    # Only recreate exported nodes and exporter if the segmentation was modified since last export
+    if self._exportCacheKey() != self._lastExportKey or not self._areExportedNodesInScene():
+      segmentName = self._segmentNode.GetName()
 
-    # Create Label map from visible segments
-    labelMap = self._createLabelMapVolumeNode()
+      # Create Label map from visible segments
+      labelMap = self._createLabelMapVolumeNode()
 
-    # Create volume node from label map
-    volume = self._createScalarVolumeNode(labelMap)
+      # Create volume node from label map
+      volume = self._createScalarVolumeNode(labelMap)
 
-    # Create model
-    model = self._createLabelMapModel()
+      # Create model
+      model = self._createLabelMapModel()
 
-    # Return geometry exporter with created volumes
-    geometryExporter = GeometryExporter()
-    geometryExporter[segmentName] = volume
-    geometryExporter[segmentName + "Model"] = model
-    return [geometryExporter]
+      # Create geometry exporter with created volumes
+      self._geometryExporter = GeometryExporter(**{segmentName: volume, segmentName + "Model": model})
+
+      # Key is computed after export in case the export modifies the segmentation (representation conversion)
+      self._lastExportKey = self._exportCacheKey()
+
+    return [self._geometryExporter]
+
+  def _exportCacheKey(self):
+    """Returns key identifying the exported content of the segmentation node. Key changes when segments are added,
+    removed, edited, when their visibility changes or when the input node changes.
+    """
+    segmentation = self._segmentNode.GetSegmentation()
+    displayNode = self._segmentNode.GetDisplayNode()
+    sourceRepresentationName = segmentation.GetSourceRepresentationName()
+
+    segmentKeys = []
+    for i in range(segmentation.GetNumberOfSegments()):
+      segmentId = segmentation.GetNthSegmentID(i)
+      representation = segmentation.GetNthSegment(i).GetRepresentation(sourceRepresentationName)
+      isVisible = displayNode.GetSegmentVisibility(segmentId) if displayNode is not None else True
+      segmentKeys.append((segmentId, isVisible, representation.GetMTime() if representation is not None else 0))
+
+    return self._inputNode, self._segmentNode.GetMTime(), segmentation.GetMTime(), tuple(segmentKeys)
+
+  def _areExportedNodesInScene(self):
+    return all(node is not None and node.GetScene() is slicer.mrmlScene for node in
+               [self._labelMap, self._scalarVolume]) and (
+               self._model is None or self._model.GetScene() is slicer.mrmlScene)
 
   def _createScalarVolumeNode(self, labelMap):
     removeNodeFromMRMLScene(self._scalarVolume)
@@ -171,12 +251,18 @@ class SegmentWidget(VerticalLayoutWidget):
     """
     self._layoutList.append(layout)
     self._verticalLayout.addLayout(layout)
+    self._isLayoutDirty = True
 
   def _resetLayout(self):
     """Removes all the layouts from the widget and reconstruct them in order.
     Done in order to have proper showing of only instance of segmentation UI.
     This method is called during show events of the Widget.
+    Layout is only reconstructed if layouts were added or if the segmentation UI was moved to another widget.
     """
+    if not self._isLayoutDirty and self._segmentUi.parent() is self:
+      self._segmentUi.show()
+      return
+
     # Clear layout
     self._verticalLayout.removeWidget(self._segmentUi)
     for layout in self._layoutList:
@@ -187,6 +273,7 @@ class SegmentWidget(VerticalLayoutWidget):
     for layout in self._layoutList:
       self._verticalLayout.addLayout(layout)
     self._segmentUi.show()
+    self._isLayoutDirty = False
 
   def showEvent(self, event):
     """On show events, reset layout to have proper showing of only instance of segmentation UI.
@@ -200,6 +287,9 @@ class SegmentWidget(VerticalLayoutWidget):
     # Reset layout
     self._resetLayout()
 
+    # Create segmentation volume on first show
+    self._setupSegmentNodeIfNecessary()
+
     # Update input node in case it was not properly updated yet
     self._updateSegmentationMasterVolumeNode()
 
@@ -234,7 +324,8 @@ class SegmentWidget(VerticalLayoutWidget):
     self._setNodeSelectorVisible(True)
 
     # Hide segment node
-    self._segmentNode.SetDisplayVisibility(False)
+    if self._segmentNode is not None:
+      self._segmentNode.SetDisplayVisibility(False)
 
     # Call superclass hideEvent
     super(SegmentWidget, self).hideEvent(event)
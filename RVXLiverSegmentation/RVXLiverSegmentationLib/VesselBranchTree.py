@@ -1,10 +1,16 @@
+import sys
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
 import qt
 import slicer
 import vtk
+from vtk.util import numpy_support
 
 from RVXLiverSegmentationLib import Signal, PlaceStatus, VesselBranchWizard, removeNodeFromMRMLScene, InteractionStatus, \
   VesselTreeColumnRole, VesselHelpWidget
-from .RVXLiverSegmentationUtils import Icons, getMarkupIdPositionDictionary, createMultipleMarkupFiducial, createButton
+from .RVXLiverSegmentationUtils import Icons, createMultipleMarkupFiducial, createButton
 
 
 class VesselBranchTreeItem(qt.QTreeWidgetItem):
@@ -13,7 +19,8 @@ class VesselBranchTreeItem(qt.QTreeWidgetItem):
 
   def __init__(self, nodeId, status=PlaceStatus.NOT_PLACED):
     qt.QTreeWidgetItem.__init__(self)
-    self.nodeId = nodeId
+    self.nodeId = sys.intern(nodeId)
+    self.childIndex = -1
     self.setIcon(VesselTreeColumnRole.DELETE, Icons.delete)
     self._status = status
     self.updateText()
@@ -51,6 +58,8 @@ class VesselBranchTree(qt.QTreeWidget):
 
     self._branchDict = {}
     self._vesselHelpWidget = vesselHelpWidget
+    self._batchDepth = 0
+    self._isExpandPending = False
 
     # Configure tree widget
     self.setColumnCount(3)
@@ -64,6 +73,9 @@ class VesselBranchTree(qt.QTreeWidget):
     self.header().setSectionResizeMode(2, qt.QHeaderView.ResizeToContents)
     self.headerItem().setIcon(VesselTreeColumnRole.DELETE, Icons.delete)
 
+    # Every row displays the same name and icon columns. Avoids computing each row height on layout
+    self.setUniformRowHeights(True)
+
     # Enable reordering by drag and drop
     self.setDragEnabled(True)
     self.setDropIndicatorShown(True)
@@ -73,6 +85,40 @@ class VesselBranchTree(qt.QTreeWidget):
     self._branchDict = {}
     qt.QTreeWidget.clear(self)
 
+  @contextmanager
+  def batchUpdates(self):
+    """Context manager deferring the tree expansion done after each insertion to the exit of the outermost scope.
+    Widget repaints, sorting and signals are disabled in the scope. Should be used when inserting multiple nodes at
+    once.
+    """
+    isOutermostScope = self._batchDepth == 0
+    if isOutermostScope:
+      wasUpdatesEnabled = self.updatesEnabled
+      wasSortingEnabled = self.isSortingEnabled()
+      wereSignalsBlocked = self.blockSignals(True)
+      self.setUpdatesEnabled(False)
+      self.setSortingEnabled(False)
+
+    self._batchDepth += 1
+    try:
+      yield
+    finally:
+      self._batchDepth -= 1
+      if isOutermostScope:
+        if self._isExpandPending:
+          self._isExpandPending = False
+          self.expandAll()
+
+        self.setSortingEnabled(wasSortingEnabled)
+        self.blockSignals(wereSignalsBlocked)
+        self.setUpdatesEnabled(wasUpdatesEnabled)
+
+  def _expandAllAfterInsert(self):
+    if self._batchDepth > 0:
+      self._isExpandPending = True
+    else:
+      self.expandAll()
+
   def clickItem(self, item):
     item = self.getTreeWidgetItem(item) if isinstance(item, str) else item
     self.setItemSelected(item)
@@ -92,14 +138,9 @@ class VesselBranchTree(qt.QTreeWidget):
       Next vessel branch tree which has not been placed yet in the scene
     """
     item = self.getTreeWidgetItem(nodeId)
-    if item is None:
-      return None
-
-    if item.status == PlaceStatus.NOT_PLACED:
-      return item
-
-    nextItem = self._getNextItem(nodeId)
-    return self.getNextUnplacedItem(nextItem.nodeId) if nextItem is not None else None
+    while item is not None and item.status != PlaceStatus.NOT_PLACED:
+      item = self._getNextItem(item.nodeId)
+    return item
 
   def isInTree(self, nodeId):
     """
@@ -113,7 +154,7 @@ class VesselBranchTree(qt.QTreeWidget):
     bool
       True if nodeId is part of the tree, False otherwise.
     """
-    return nodeId in self._branchDict.keys()
+    return nodeId in self._branchDict
 
   def isRoot(self, nodeId):
     """
@@ -126,6 +167,7 @@ class VesselBranchTree(qt.QTreeWidget):
     """
     qt.QTreeWidget.dropEvent(self, event)
     self.enforceOneRoot()
+    self._reindexAllChildren()
 
   def keyPressEvent(self, event):
     """Overridden from qt.QTreeWidget to notify listeners of key event
@@ -157,6 +199,7 @@ class VesselBranchTree(qt.QTreeWidget):
     parent = nodeItem.parent()
     if parent is not None:
       parent.removeChild(nodeItem)
+      self._reindexChildren(parent)
     else:
       self.takeTopLevelItem(self.indexOfTopLevelItem(nodeItem))
 
@@ -174,13 +217,15 @@ class VesselBranchTree(qt.QTreeWidget):
     nodeItem = self._takeItem(nodeId)
     nodeItem.status = status
     if not parentId:
-      hasRoot = self.topLevelItemCount > 0
+      # Attach the existing root to the new item before inserting it in the tree
+      if self.topLevelItemCount > 0:
+        nodeItem.addChild(self.takeTopLevelItem(0))
+        self._reindexChildren(nodeItem)
       self.addTopLevelItem(nodeItem)
-      if hasRoot:
-        rootItem = self.takeTopLevelItem(0)
-        nodeItem.addChild(rootItem)
     else:
-      self._branchDict[parentId].addChild(nodeItem)
+      parentItem = self._branchDict[parentId]
+      parentItem.addChild(nodeItem)
+      self._reindexChildren(parentItem)
 
     self._branchDict[nodeId] = nodeItem
     return nodeItem
@@ -205,7 +250,7 @@ class VesselBranchTree(qt.QTreeWidget):
     """
     node = self._insertNode(nodeId, parentNodeId, status)
     node.setToolTip(0, self._vesselHelpWidget.tooltipImageUrl(nodeId))
-    self.expandAll()
+    self._expandAllAfterInsert()
 
   def insertBeforeNode(self, nodeId, beforeNodeId, status=PlaceStatus.NOT_PLACED):
     """Insert given node before the input parent Id. Inserts new node as root if childNodeId is None.
@@ -229,11 +274,11 @@ class VesselBranchTree(qt.QTreeWidget):
       parentNodeId = self.getParentNodeId(beforeNodeId)
       childItem = self._takeItem(beforeNodeId)
 
-      self._insertNode(nodeId, parentNodeId, status)
       nodeItem = self._insertNode(nodeId, parentNodeId, status)
       nodeItem.addChild(childItem)
+      self._reindexChildren(nodeItem)
 
-    self.expandAll()
+    self._expandAllAfterInsert()
 
   def removeNode(self, nodeId):
     """Remove given node from tree.
@@ -251,11 +296,12 @@ class VesselBranchTree(qt.QTreeWidget):
     bool - True if node was removed, False otherwise
     """
     nodeItem = self._branchDict[nodeId]
-    if nodeItem.parent() is None:
-      return self._removeRootItem(nodeItem, nodeId)
-    else:
-      self._removeIntermediateItem(nodeItem, nodeId)
-      return True
+    with self.batchUpdates():
+      if nodeItem.parent() is None:
+        return self._removeRootItem(nodeItem, nodeId)
+      else:
+        self._removeIntermediateItem(nodeItem, nodeId)
+        return True
 
   def _removeRootItem(self, nodeItem, nodeId):
     """Only remove if it has exactly one direct child and replace root by child. Else does nothing.
@@ -282,9 +328,9 @@ class VesselBranchTree(qt.QTreeWidget):
     """Move each child of node to node parent and remove item.
     """
     parentItem = nodeItem.parent()
-    parentItem.takeChild(parentItem.indexOfChild(nodeItem))
-    for child in nodeItem.takeChildren():
-      parentItem.addChild(child)
+    parentItem.takeChild(self._childIndex(parentItem, nodeItem))
+    parentItem.addChildren(nodeItem.takeChildren())
+    self._reindexChildren(parentItem)
     del self._branchDict[nodeId]
 
   def getParentNodeId(self, childNodeId):
@@ -325,9 +371,38 @@ class VesselBranchTree(qt.QTreeWidget):
     if parent is None:
       return None
     else:
-      iSibling = parent.indexOfChild(nodeItem) + nextIncrement
+      iSibling = self._childIndex(parent, nodeItem) + nextIncrement
       return parent.child(iSibling).nodeId if (0 <= iSibling < parent.childCount()) else None
 
+  @staticmethod
+  def _reindexChildren(parentItem):
+    """Updates the cached child index of every child of the input item. Called after structural changes of the item.
+    """
+    for i in range(parentItem.childCount()):
+      parentItem.child(i).childIndex = i
+
+  def _reindexAllChildren(self):
+    """Updates the cached child index of every item in the tree.
+    """
+    items = [self.topLevelItem(i) for i in range(self.topLevelItemCount)]
+    while items:
+      item = items.pop()
+      self._reindexChildren(item)
+      items += [item.child(i) for i in range(item.childCount())]
+
+  def _childIndex(self, parentItem, nodeItem):
+    """
+    Returns
+    -------
+    int
+      Index of nodeItem in parentItem children. Uses the cached child index and refreshes it if it is outdated.
+    """
+    iChild = nodeItem.childIndex
+    if not (0 <= iChild < parentItem.childCount()) or parentItem.child(iChild) is not nodeItem:
+      self._reindexChildren(parentItem)
+      iChild = nodeItem.childIndex
+    return iChild
+
   def _getNextItem(self, nodeId, lookInChildren=True):
     """
     Parameters
@@ -348,12 +423,14 @@ class VesselBranchTree(qt.QTreeWidget):
     if lookInChildren and nodeItem.childCount() > 0:
       return nodeItem.child(0)
 
-    nextSiblingId = self._getSiblingId(nodeId, 1)
-    if nextSiblingId is not None:
-      return self.getTreeWidgetItem(nextSiblingId)
+    # Look for next sibling of the node or of its closest ancestor
+    while nodeItem is not None:
+      nextSiblingId = self._getSiblingId(nodeItem.nodeId, 1)
+      if nextSiblingId is not None:
+        return self.getTreeWidgetItem(nextSiblingId)
+      nodeItem = nodeItem.parent()
 
-    parent = nodeItem.parent()
-    return self._getNextItem(parent.nodeId, lookInChildren=False) if parent is not None else None
+    return None
 
   def getNextSiblingNodeId(self, nodeId):
     """
@@ -392,8 +469,13 @@ class VesselBranchTree(qt.QTreeWidget):
     """
     roots = [self.topLevelItem(i) for i in range(self.topLevelItemCount)]
     treeParentList = [[None, root.nodeId] for root in roots]
-    for root in roots:
-      treeParentList += self._getChildrenAdjacentLists(root)
+    items = deque(roots)
+    while items:
+      item = items.popleft()
+      for i in range(item.childCount()):
+        child = item.child(i)
+        treeParentList.append([item.nodeId, child.nodeId])
+        items.append(child)
 
     return treeParentList
 
@@ -404,13 +486,10 @@ class VesselBranchTree(qt.QTreeWidget):
     List[str]
       List of nodeIds which have been placed in the mrmlScene
     """
-    return [nodeId for nodeId in self.getNodeList() if self._isPlaced(nodeId)]
+    return [nodeId for nodeId, item in self._branchDict.items() if item.status == PlaceStatus.PLACED]
 
   def areAllNodesPlaced(self):
-    return all([self._isPlaced(nodeId) for nodeId in self.getNodeList()])
-
-  def _isPlaced(self, nodeId):
-    return self.getTreeWidgetItem(nodeId).status == PlaceStatus.PLACED
+    return all(item.status == PlaceStatus.PLACED for item in self._branchDict.values())
 
   def getNodeList(self):
     """
@@ -437,19 +516,6 @@ class VesselBranchTree(qt.QTreeWidget):
     """
     return len(self.getChildrenNodeId(nodeId)) == 0
 
-  def _getChildrenAdjacentLists(self, nodeItem):
-    """
-    Returns
-    -------
-    List[List[str]]
-      List of every [parentId, childId] pair starting from nodeItem in the tree.
-    """
-    children = [nodeItem.child(i) for i in range(nodeItem.childCount())]
-    nodeList = [[nodeItem.nodeId, child.nodeId] for child in children]
-    for child in children:
-      nodeList += self._getChildrenAdjacentLists(child)
-    return nodeList
-
   def enforceOneRoot(self):
     """Reorders tree to have only one root item. If elements are defined after root, they will be inserted before
     current root. Methods is called during drop events.
@@ -458,20 +524,17 @@ class VesselBranchTree(qt.QTreeWidget):
     if self.topLevelItemCount <= 1:
       return
 
-    # Set current root as second item child
-    newRoot = self.takeTopLevelItem(1)
-    currentRoot = self.takeTopLevelItem(0)
-    newRoot.addChild(currentRoot)
+    # Take every root at once and chain them so that each root becomes the last child of the following root
+    # Items are taken from the last one so that Qt doesn't shift the remaining top level items
+    topLevelItems = [self.takeTopLevelItem(i) for i in reversed(range(self.topLevelItemCount))][::-1]
+    for childItem, parentItem in zip(topLevelItems[:-1], topLevelItems[1:]):
+      parentItem.addChild(childItem)
+      self._reindexChildren(parentItem)
 
-    # Add the new root to the tree
-    self.insertTopLevelItem(0, newRoot)
-
-    # Expand both items
-    newRoot.setExpanded(True)
-    currentRoot.setExpanded(True)
-
-    # Call recursively until the whole tree has only one root
-    self.enforceOneRoot()
+    # Add the last root to the tree. Items can only be expanded once they are part of the tree widget
+    self.insertTopLevelItem(0, topLevelItems[-1])
+    for item in topLevelItems:
+      item.setExpanded(True)
 
 
 class TreeDrawer(object):
@@ -488,89 +551,149 @@ class TreeDrawer(object):
     """
     self._tree = vesselTree
     self._markupFiducial = markupFiducial
+    self._lineColor = None
     self._lineWidth = 4
     self._lineOpacity = 1
+    self._batchDepth = 0
+    self._isUpdatePending = False
+    self._isVisible = True
     self._setupLineModel()
 
   def _setupLineModel(self):
-    self._polyLine = vtk.vtkPolyLineSource()
-    self._polyLine.SetClosed(False)
+    self._lineData = vtk.vtkPolyData()
     self._lineModel = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLModelNode")
-    self._lineModel.SetAndObservePolyData(self._polyLine.GetOutput())
+    self._lineModel.SetAndObservePolyData(self._lineData)
     self._lineModel.CreateDefaultDisplayNodes()
     self._lineModel.SetName("VesselBranchNodeTree")
-    self._updateNodeCoordDict()
-
-    self.setColor(qt.QColor("red"))
-    self.setLineWidth(self._lineWidth)
-    self.setOpacity(self._lineOpacity)
+    self._lineModel.SetDisplayVisibility(self._isVisible)
+    self._updateNodeCoordinates()
 
-  def _updateNodeCoordDict(self):
-    """Update node coordinates associated with node ID for the current tree
+    # Apply the last set display properties to the new display node with a single display node modification
+    lineWidth, lineOpacity = self._lineWidth, self._lineOpacity
+    self._lineColor = self._lineWidth = self._lineOpacity = None
 
-    Returns
-    -------
-    Dict[str, List[float]]
-      Dictionary containing the node ids contained in the markup node and its associated positions
-    """
-    self._nodeCoordDict = getMarkupIdPositionDictionary(self._markupFiducial)
+    displayNode = self._lineDisplayNode()
+    wasModifying = displayNode.StartModify()
+    self.setColor(qt.QColor("red"))
+    self.setLineWidth(lineWidth)
+    self.setOpacity(lineOpacity)
+    displayNode.EndModify(wasModifying)
+
+  def _updateNodeCoordinates(self):
+    """Update the markup node coordinates array and the markup row associated with each node ID. If multiple markup
+    nodes share the same ID, the last one is used.
+    """
+    self._nodeCoordinates = slicer.util.arrayFromMarkupsControlPoints(self._markupFiducial)
+    labels = [self._markupFiducial.GetNthControlPointLabel(i) for i in range(len(self._nodeCoordinates))]
+    self._nodeRows = {sys.intern(label): i for i, label in enumerate(labels)}
+
+  @contextmanager
+  def batchUpdates(self):
+    """Context manager merging the tree line updates requested in its scope into a single update done when leaving the
+    outermost scope.
+    """
+    self._batchDepth += 1
+    try:
+      yield
+    finally:
+      self._batchDepth -= 1
+      if self._batchDepth == 0 and self._isUpdatePending:
+        self._isUpdatePending = False
+        self.updateTreeLines()
 
   def updateTreeLines(self):
     """Updates the lines between the different nodes of the tree. Uses the last set line width and color
     """
+    # Defer update to the end of the current batch if any or until the drawer is shown
+    if self._batchDepth > 0 or not self._isVisible:
+      self._isUpdatePending = True
+      return
+
     # Update nodes coordinates
-    self._updateNodeCoordDict()
+    self._updateNodeCoordinates()
 
-    # Force modification by resetting number of points to 0 (other wise update will not be visible if only points
-    # position has changed)
-    self._polyLine.SetNumberOfPoints(0)
-    coordList = self._extractTreeLinePointSequence()
-    self._polyLine.SetNumberOfPoints(len(coordList))
-    for i, coord in enumerate(coordList):
-      self._polyLine.SetPoint(i, *coord)
+    # Lines share one point per markup node. Setting new points and cells forces the modification of the line poly
+    # data (otherwise update will not be visible if only points position has changed)
+    points = vtk.vtkPoints()
+    points.SetData(numpy_support.numpy_to_vtk(self._nodeCoordinates, deep=True))
+    connectivity = self._extractTreeLineConnectivity()
+    lines = vtk.vtkCellArray()
+    lines.SetCells(len(connectivity) // 3, numpy_support.numpy_to_vtkIdTypeArray(connectivity, deep=True))
 
-    # Trigger poly line update
-    self._polyLine.Update()
+    self._lineData.SetPoints(points)
+    self._lineData.SetLines(lines)
+    self._lineData.Modified()
 
-  def _extractTreeLinePointSequence(self, parentId=None):
-    """Constructs a coordinate sequence starting from parentId node recursively.
+  def _extractTreeLineConnectivity(self):
+    """Constructs the line segments between each node placed in the markup and its closest placed ancestor, starting
+    from the tree root.
 
     example :
     parent
       |_ child
             |_ sub child
-      |_ child2
+      |_ child2 (not placed)
+            |_ sub child2
 
-    Previous tree will generate coordinates : [parent, child, sub child, child, parent, child2, parent]
-    This coordinate construction enables using only one poly line instead of multiple lines at the expense of
-    constructed lines number
-
-    Parameters
-    ----------
-    parentId: str or None
-      Starting point of the recursion. If none, will start from tree root
+    Previous tree will generate segments : [parent, child], [child, sub child], [parent, sub child2]
+    Each node is stored once in the line points, at its markup index, and shared by all its segments.
 
     Returns
     -------
-    List[List[float]]
-      Coordinate sequence for polyLine construction
+    np.ndarray
+      VTK cell array connectivity of the segments in the format [2, ancestorIndex, nodeIndex, 2, ...]
     """
-    if parentId is None:
-      parentId = self._tree.getRootNodeId()
+    connectivity = []
+    rootId = self._tree.getRootNodeId()
 
-    # Early return if tree is empty
-    if not parentId:
-      return []
+    # Stack of nodes left to visit and their closest placed ancestor
+    stack = [(rootId, None)] if rootId else []
+    while stack:
+      nodeId, ancestorRow = stack.pop()
+      row = self._nodeRows.get(nodeId)
+      if row is not None:
+        if ancestorRow is not None:
+          connectivity += [2, ancestorRow, row]
+        ancestorRow = row
+
+      stack += [(childId, ancestorRow) for childId in self._tree.getChildrenNodeId(nodeId)]
+
+    return np.array(connectivity, dtype=numpy_support.ID_TYPE_CODE)
+
+  def updateNodePosition(self, iNode):
+    """Moves the line point of the input markup point to its current position. Falls back to a full line update if
+    the markup points changed since the last update.
+
+    Parameters
+    ----------
+    iNode: int or None
+      Index of the modified markup point
+    """
+    pointCount = self._markupFiducial.GetNumberOfControlPoints()
+    isPointValid = isinstance(iNode, int) and 0 <= iNode < pointCount == self._lineData.GetNumberOfPoints()
+    if not self._isVisible or not isPointValid:
+      self.updateTreeLines()
+      return
+
+    # Renamed markup points modify the line segments
+    nodeId = self._markupFiducial.GetNthControlPointLabel(iNode)
+    if self._nodeRows.get(nodeId) != iNode:
+      self.updateTreeLines()
+      return
+
+    # Markup points removed from the tree are not part of any line segment
+    if not self._tree.isInTree(nodeId):
+      return
 
-    parentCoord = self._nodeCoordinate(parentId)
-    pointSeq = [parentCoord]
-    for childId in self._tree.getChildrenNodeId(parentId):
-      pointSeq += self._extractTreeLinePointSequence(childId)
-      pointSeq.append(parentCoord)
-    return [point for point in pointSeq if point is not None]
+    position = [0] * 3
+    self._markupFiducial.GetNthControlPointPosition(iNode, position)
+    self._nodeCoordinates[iNode] = position
 
-  def _nodeCoordinate(self, nodeId):
-    return self._nodeCoordDict[nodeId] if nodeId in self._nodeCoordDict else None
+    # Points modification is not propagated to the line poly data
+    points = self._lineData.GetPoints()
+    points.SetPoint(iNode, position)
+    points.Modified()
+    self._lineData.Modified()
 
   def setColor(self, lineColor):
     """
@@ -579,7 +702,12 @@ class TreeDrawer(object):
     lineColor: qt.QColor
       New color for line. Call updateTreeLines to apply to tree.
     """
-    self._lineDisplayNode().SetColor(lineColor.red(), lineColor.green(), lineColor.blue())
+    lineColor = (lineColor.red(), lineColor.green(), lineColor.blue())
+    if lineColor == self._lineColor:
+      return
+
+    self._lineDisplayNode().SetColor(*lineColor)
+    self._lineColor = lineColor
 
   def setLineWidth(self, lineWidth):
     """
@@ -588,6 +716,9 @@ class TreeDrawer(object):
     lineWidth: float
       New line width for lines of the tree.  Call updateTreeLines to apply to tree.
     """
+    if lineWidth == self._lineWidth:
+      return
+
     self._lineDisplayNode().SetLineWidth(lineWidth)
     self._lineWidth = lineWidth
 
@@ -601,6 +732,9 @@ class TreeDrawer(object):
     """
     :param opacity: float - Opacity of the lines
     """
+    if opacity == self._lineOpacity:
+      return
+
     self._lineDisplayNode().SetOpacity(opacity)
     self._lineOpacity = opacity
 
@@ -617,8 +751,14 @@ class TreeDrawer(object):
     isVisible: bool
       If true, will show tree in mrmlScene. Else will hide tree model
     """
+    self._isVisible = isVisible
     self._lineModel.SetDisplayVisibility(isVisible)
 
+    # Apply the updates skipped while the drawer was hidden
+    if isVisible and self._isUpdatePending:
+      self._isUpdatePending = False
+      self.updateTreeLines()
+
   def _lineDisplayNode(self):
     return self._lineModel.GetDisplayNode()
 
@@ -667,6 +807,7 @@ class MarkupNode(object):
     self.GetNthControlPointLabel = self._node.GetNthControlPointLabel
     self.GetNthControlPointPosition = self._node.GetNthControlPointPosition
     self.GetNthFiducialVisibility = self._node.GetNthFiducialVisibility
+    self.GetNthControlPointVisibility = self._node.GetNthControlPointVisibility
     self.SetNthControlPointVisibility = self._node.SetNthControlPointVisibility
     self.SetNthControlPointLabel = self._node.SetNthControlPointLabel
     self.SetName = self._node.SetName
@@ -674,6 +815,8 @@ class MarkupNode(object):
     self.GetLocked = self._node.GetLocked
     self.GetDisplayNode = self._node.GetDisplayNode
     self.RemoveAllControlPoints = self._node.RemoveAllControlPoints
+    self.StartModify = self._node.StartModify
+    self.EndModify = self._node.EndModify
 
   def GetSlicerNode(self):
     return self._node
@@ -697,7 +840,8 @@ class MarkupNode(object):
   def _emitPointInteractionEnded(self, caller, callData):
     self.pointInteractionEnded.emit(callData)
 
-  def _emitPointModified(self, caller, callData):
+  @vtk.calldata_type(vtk.VTK_INT)
+  def _emitPointModified(self, caller, event, callData):
     self.pointModified.emit(callData)
 
 
@@ -1,3 +1,5 @@
+import sys
+
 import qt
 
 from RVXLiverSegmentationLib import Signal, jumpSlicesToNthMarkupPosition
@@ -155,13 +157,15 @@ class VesselBranchWizard(object):
     self._placeWidget = nodePlaceWidget
     self._currentTreeItem = None
     self._treeDrawer = treeDrawer
+    self._nodeIndexes = {}
+    self._isTreeLinesUpdateScheduled = False
+    self._modifiedNodeIndexes = set()
+    self._nodeVisibilityState = None
 
     self._tree.connect("itemClicked(QTreeWidgetItem *, int)", self.onItemClicked)
-    self._tree.connect("currentItemChanged(QTreeWidgetItem *), QTreeWidgetItem *)",
-                       lambda current, previous: self.onItemClicked(current, 0))
     self._tree.keyPressed.connect(self.onKeyPressed)
     self._node.pointAdded.connect(self.onMarkupPointAdded)
-    self._node.pointModified.connect(lambda *x: self._treeDrawer.updateTreeLines())
+    self._node.pointModified.connect(self._onMarkupPointModified)
     self._node.pointInteractionEnded.connect(lambda *x: self._treeDrawer.updateTreeLines())
     self._placeWidget.placeModeChanged.connect(self._onNodePlaceModeChanged)
 
@@ -193,7 +197,8 @@ class VesselBranchWizard(object):
     """
     Prepares tree with the different hepatic vessel node names
     """
-    self._setupDefaultBranchF(self._tree)
+    with self._tree.batchUpdates():
+      self._setupDefaultBranchF(self._tree)
     self._placingFinished = False
 
   def getInteractionStatus(self):
@@ -204,8 +209,7 @@ class VesselBranchWizard(object):
     If current node and parent node are placed, enables node placing and set node as insert before
     """
     self.onStopInteraction()
-    insertEnabled = self._isCurrentNodePlaced() and self._isParentNodePlaced()
-    if insertEnabled and self._isCurrentNodePlaced() and self._isParentNodePlaced():
+    if self._isCurrentNodePlaced() and self._isParentNodePlaced():
       self._placeWidget.setPlaceModeEnabled(True)
       self._currentTreeItem.status = PlaceStatus.INSERT_BEFORE
       self._updateCurrentInteraction(InteractionStatus.INSERT_BEFORE)
@@ -243,9 +247,10 @@ class VesselBranchWizard(object):
     self._updateCurrentInteraction(InteractionStatus.STOPPED)
 
   def _deactivatePreviousItem(self):
-    if self._currentItemPlaceStatus() == PlaceStatus.PLACING:
+    placeStatus = self._currentItemPlaceStatus()
+    if placeStatus == PlaceStatus.PLACING:
       self._currentTreeItem.status = PlaceStatus.NOT_PLACED
-    elif self._currentItemPlaceStatus() == PlaceStatus.INSERT_BEFORE:
+    elif placeStatus == PlaceStatus.INSERT_BEFORE:
       self._currentTreeItem.status = PlaceStatus.PLACED
 
   def onItemClicked(self, treeItem, column):
@@ -253,20 +258,21 @@ class VesselBranchWizard(object):
     On item clicked, start placing item if necessary.
     Delete item if delete column was selected
     """
-    self._deactivatePreviousItem()
+    with self._treeDrawer.batchUpdates():
+      self._deactivatePreviousItem()
 
-    self._currentTreeItem = treeItem
-    if column == VesselTreeColumnRole.DELETE:
-      self._onDeleteItem(treeItem)
-    elif column == VesselTreeColumnRole.INSERT_BEFORE:
-      self.onInsertBeforeNode()
-    elif treeItem.status == PlaceStatus.NOT_PLACED:
-      self.onStartPlacing()
-    elif self._interactionStatus == InteractionStatus.PLACING and treeItem.status == PlaceStatus.PLACED:
-      self.onStopInteraction()
+      self._currentTreeItem = treeItem
+      if column == VesselTreeColumnRole.DELETE:
+        self._onDeleteItem(treeItem)
+      elif column == VesselTreeColumnRole.INSERT_BEFORE:
+        self.onInsertBeforeNode()
+      elif treeItem.status == PlaceStatus.NOT_PLACED:
+        self.onStartPlacing()
+      elif self._interactionStatus == InteractionStatus.PLACING and treeItem.status == PlaceStatus.PLACED:
+        self.onStopInteraction()
 
-    self._jumpSlicesToCurrentNode()
-    self._treeDrawer.updateTreeLines()
+      self._jumpSlicesToCurrentNode()
+      self._treeDrawer.updateTreeLines()
 
   def _jumpSlicesToCurrentNode(self):
     """
@@ -287,10 +293,29 @@ class VesselBranchWizard(object):
     int or None
       Markup index associated with id if found else None
     """
+    iNode = self._nodeIndexes.get(nodeId)
+    if not self._isNodeIndexValid(iNode, nodeId):
+      self._nodeIndexes = self._markupNodeIndexes()
+      iNode = self._nodeIndexes.get(nodeId)
+    return iNode
+
+  def _isNodeIndexValid(self, iNode, nodeId):
+    """
+    Cached indexes are checked against the markup before use as control points can be added, renamed or removed
+    outside of the wizard.
+    """
+    return iNode is not None and iNode < self._node.GetNumberOfControlPoints() and \
+           self._node.GetNthControlPointLabel(iNode) == nodeId
+
+  def _markupNodeIndexes(self):
+    """
+    :return: dict of markup label to first markup index with this label
+    """
+    # Labels are interned so that lookups with the tree node IDs short-circuit on identity
+    nodeIndexes = {}
     for i in range(self._node.GetNumberOfControlPoints()):
-      if self._node.GetNthControlPointLabel(i) == nodeId:
-        return i
-    return None
+      nodeIndexes.setdefault(sys.intern(self._node.GetNthControlPointLabel(i)), i)
+    return nodeIndexes
 
   def _updateCurrentInteraction(self, interaction):
     if self._interactionStatus != interaction:
@@ -309,27 +334,49 @@ class VesselBranchWizard(object):
     """
     Remove the item from the tree and hide the associated markup
     """
-    self.onStopInteraction()
-    self._tree.removeNode(treeItem.nodeId)
-    self.updateNodeVisibility()
-    if self._currentTreeItem == treeItem:
-      self._currentTreeItem = None
-    self._updatePlacingFinished()
+    with self._treeDrawer.batchUpdates():
+      self.onStopInteraction()
+      self._tree.removeNode(treeItem.nodeId)
+      self.updateNodeVisibility()
+      if self._currentTreeItem == treeItem:
+        self._currentTreeItem = None
+      self._updatePlacingFinished()
 
   def updateNodeVisibility(self):
     """
     Hides markup nodes which may have been deleted
     """
-    for i in range(self._node.GetNumberOfControlPoints()):
-      self._node.SetNthControlPointVisibility(i, self._tree.isInTree(self._node.GetNthControlPointLabel(i)))
+    # Visibility only needs to be updated if the tree nodes or the markup points changed since last update
+    visibilityState = (frozenset(self._tree.getNodeList()), self._node.GetNumberOfControlPoints())
+    if visibilityState != self._nodeVisibilityState:
+      self._setTreeNodesVisible(True)
+      self._nodeVisibilityState = visibilityState
 
     self._treeDrawer.updateTreeLines()
 
+  def _setTreeNodesVisible(self, isVisible):
+    """
+    Show or hide the markup nodes which are part of the tree and hide the others. Markup is modified only once and
+    only for the nodes whose visibility changed.
+    """
+    wasModifying = self._node.StartModify()
+    for i in range(self._node.GetNumberOfControlPoints()):
+      isNodeVisible = isVisible and self._tree.isInTree(self._node.GetNthControlPointLabel(i))
+      if bool(self._node.GetNthControlPointVisibility(i)) != isNodeVisible:
+        self._node.SetNthControlPointVisibility(i, isNodeVisible)
+    self._node.EndModify(wasModifying)
+
   def onMarkupPointAdded(self):
     """
     On markup added, modify its status to placed and select the next unplaced node in the tree
     """
-    if self._currentTreeItem is not None:
+    # Points added outside of the wizard placement (markup loading for instance) don't modify the tree. Only draw the
+    # lines once after the last of the points has been added.
+    if self._currentTreeItem is None:
+      self._scheduleTreeLinesUpdate()
+      return
+
+    with self._treeDrawer.batchUpdates():
       self._currentTreeItem.status = PlaceStatus.PLACED
 
       if self._interactionStatus == InteractionStatus.PLACING:
@@ -337,8 +384,33 @@ class VesselBranchWizard(object):
       elif self._interactionStatus == InteractionStatus.INSERT_BEFORE:
         self._insertPlacedNodeBeforeCurrent()
 
+      self._treeDrawer.updateTreeLines()
+      self._updatePlacingFinished()
+
+  def _scheduleTreeLinesUpdate(self):
+    if not self._isTreeLinesUpdateScheduled:
+      self._isTreeLinesUpdateScheduled = True
+      qt.QTimer.singleShot(0, self._onScheduledTreeLinesUpdate)
+
+  def _onScheduledTreeLinesUpdate(self):
+    self._isTreeLinesUpdateScheduled = False
     self._treeDrawer.updateTreeLines()
-    self._updatePlacingFinished()
+
+  def _onMarkupPointModified(self, iNode):
+    """
+    Markup points emit a modified event for each mouse move when dragged. Only move the tree lines once per event loop
+    iteration.
+    """
+    if not self._modifiedNodeIndexes:
+      qt.QTimer.singleShot(0, self._onScheduledNodePositionsUpdate)
+    self._modifiedNodeIndexes.add(iNode)
+
+  def _onScheduledNodePositionsUpdate(self):
+    modifiedNodeIndexes = self._modifiedNodeIndexes
+    self._modifiedNodeIndexes = set()
+    with self._treeDrawer.batchUpdates():
+      for iNode in modifiedNodeIndexes:
+        self._treeDrawer.updateNodePosition(iNode)
 
   def _placeCurrentNodeAndActivateNext(self):
     self._renamePlacedNode(self._currentTreeItem.nodeId)
@@ -371,19 +443,17 @@ class VesselBranchWizard(object):
     if nodeId in VeinId().sortedIds():
       return "{}_0".format(nodeId)
 
-    nameParts = nodeId.split("_")
-    i_node = int(nameParts[-1]) + 1 if len(nameParts) > 1 else 0
-    return "{}_{}".format("_".join(nameParts[:-1]), i_node)
+    baseId, separator, nodeIndex = nodeId.rpartition("_")
+    i_node = int(nodeIndex) + 1 if separator else 0
+    return "{}_{}".format(baseId, i_node)
 
   def setVisibleInScene(self, isVisible):
     """
     Show or hide the tree and the nodes in the scene
     """
     self._treeDrawer.setVisible(isVisible)
-
-    for i in range(self._node.GetNumberOfControlPoints()):
-      isNodeVisible = isVisible and self._tree.isInTree(self._node.GetNthControlPointLabel(i))
-      self._node.SetNthControlPointVisibility(i, isNodeVisible)
+    self._setTreeNodesVisible(isVisible)
+    self._nodeVisibilityState = None
 
   def _updatePlacingFinished(self):
     """
@@ -415,18 +485,20 @@ class VesselBranchWizard(object):
     return treeBranches
 
   def _getNodePosition(self, nodeId):
-    for i in range(self._node.GetNumberOfControlPoints()):
-      if self._node.GetNthControlPointLabel(i) == nodeId:
-        position = [0] * 3
-        self._node.GetNthControlPointPosition(i, position)
-        return position
+    iNode = self._nodeIndex(nodeId)
+    if iNode is None:
+      return None
 
-    return None
+    position = [0] * 3
+    self._node.GetNthControlPointPosition(iNode, position)
+    return position
 
   def clear(self):
     self._tree.clear()
     self._treeDrawer.clear()
     self._node.RemoveAllControlPoints()
+    self._nodeIndexes = {}
+    self._nodeVisibilityState = None
     self._setupDefaultBranchNodes()
 
 
@@ -21,6 +21,7 @@ class VesselSegmentEditWidget(SegmentWidget):
     self._proceedButton.setEnabled(False)
     self._treeWizard = treeWizard
     self._segmentOpacity = 0.5
+    self._fillInsideButton = None
 
   def getCenterLineVolume(self):
     return self._centerLineVolume
@@ -50,14 +51,25 @@ class VesselSegmentEditWidget(SegmentWidget):
     progressDialog.hide()
 
   def _extractCenterLine(self):
-    branchVolume = self._getSegmentClosedModel(self._segmentNodeName)
+    branchVolume = self._getSegmentClosedPolyData()
     if self._hasInvalidVolume(branchVolume):
       return
 
     startPoints, endPoints = self._vesselBranches.startPoints(), self._vesselBranches.endPoints()
     self._centerLineVolume = self._logic.centerLineFilterFromNodePositions(branchVolume, startPoints, endPoints)
+    self._logic.resampleCenterLine(self._centerLineVolume, self._centerLineSpacing(branchVolume))
     self._centerLineVolume.SetName(self._segmentNodeName + "CenterLine")
 
+  @staticmethod
+  def _centerLineSpacing(polyData):
+    """Center line point spacing derived from the vessel surface size to keep the number of center line points
+    independent of the surface resolution. Spacing is 0 for a degenerate surface, in which case the center line is not
+    resampled.
+    """
+    bounds = polyData.GetBounds()
+    boundsDiagonal = sum((bounds[2 * i + 1] - bounds[2 * i]) ** 2 for i in range(3)) ** 0.5
+    return boundsDiagonal / 500.0
+
   def _prepareSplittingTools(self):
     # Get segmentation editor widget
     segmentEditorNode = self._segmentationWidget.mrmlSegmentEditorNode()
@@ -66,7 +78,7 @@ class VesselSegmentEditWidget(SegmentWidget):
     self._selectScissorsWithFillInsideOption(segmentEditorNode)
 
     # Set filtered segment as vessel tree
-    treeId = self._segmentNode.GetSegmentation().GetSegmentIdBySegmentName(self._segmentNodeName)
+    treeId = self._segmentationObj().GetSegmentIdBySegmentName(self._segmentNodeName)
     segmentEditorNode.SetMaskSegmentID(treeId)
 
     # Allow editing inside a segment only
@@ -74,38 +86,39 @@ class VesselSegmentEditWidget(SegmentWidget):
 
   def _selectScissorsWithFillInsideOption(self, segmentEditorNode):
     segmentEditorNode.SetActiveEffectName("Scissors")
+    if self._fillInsideButton is None:
+      self._fillInsideButton = self._findFillInsideButton()
+
+    if self._fillInsideButton is not None:
+      self._fillInsideButton.click()
+
+  def _findFillInsideButton(self):
+    """Looks for the fill inside option button in the scissors effect options. Effect options are kept by the
+    segmentation widget so the button only needs to be looked for once.
+    """
     activeEffect = self._segmentationWidget.activeEffect()
     if activeEffect is None:
-      return
+      return None
 
     activeEffectOptionFrame = activeEffect.optionsFrame()
-    fillInsideButton = None
     for child in activeEffectOptionFrame.children():
-      if not hasattr(child, "text"):
-        continue
+      text = getattr(child, "text", None)
+      if isinstance(text, str) and text.lower().startswith("fill inside"):
+        return child
 
-      if "fill inside" in child.text.lower():
-        fillInsideButton = child
-        break
-
-    if fillInsideButton is not None:
-      fillInsideButton.click()
-
-  def _getSegmentClosedModel(self, segmentName):
-    modelName = "{}Model".format(segmentName)
-    removeNodeFromMRMLScene(modelName)
+    return None
 
+  def _getSegmentClosedPolyData(self):
+    """
+    :return: vtkPolyData closed surface of the vessel tree segment. Surface is not added to the scene.
+    """
     polyData = vtk.vtkPolyData()
     segmentId = self._segmentationObj().GetNthSegmentID(0)
     self._segmentationLogic.GetSegmentClosedSurfaceRepresentation(self._segmentNode, segmentId, polyData)
+    return polyData
 
-    model = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLModelNode")
-    model.SetAndObservePolyData(polyData)
-    model.SetName(modelName)
-    return model
-
-  def _hasInvalidVolume(self, volume):
-    return volume.GetPolyData().GetNumberOfPolys() == 0
+  def _hasInvalidVolume(self, polyData):
+    return polyData.GetNumberOfPolys() == 0
 
   def _removePreviousCenterLineVolume(self):
     removeNodeFromMRMLScene(self._centerLineVolume)
@@ -119,15 +132,17 @@ class VesselSegmentEditWidget(SegmentWidget):
     self.setVisibleInScene(self.visible)
 
   def _importLabelMap(self, vesselLabelMap):
+    self._setupSegmentNodeIfNecessary()
     self._segmentationLogic.ImportLabelmapToSegmentationNode(vesselLabelMap, self._segmentNode)
     self._segmentNode.GetDisplayNode().SetOpacity3D(1)
 
     # Raise if segmentation is empty
-    if self._segmentationObj().GetNumberOfSegments() < 1:
+    segmentation = self._segmentationObj()
+    if segmentation.GetNumberOfSegments() < 1:
       raise ValueError("Failed to extract vessel tree from vesselness volume.")
 
     # Rename imported segment
-    self._segmentationObj().GetNthSegment(0).SetName(self._segmentNodeName)
+    segmentation.GetNthSegment(0).SetName(self._segmentNodeName)
 
   def getGeometryExporters(self):
     exporters = super(VesselSegmentEditWidget, self).getGeometryExporters()
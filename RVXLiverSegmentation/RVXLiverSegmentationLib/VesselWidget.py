@@ -529,9 +529,11 @@ class VesselWidget(VerticalLayoutWidget):
     self._updateVisibility()
 
   def _removePreviouslyExtractedVessels(self):
-    """Remove previous nodes from mrmlScene if necessary.
+    """Remove previous nodes from mrmlScene if necessary and release the references to the removed nodes.
     """
     removeNodesFromMRMLScene([self._vesselVolumeNode, self._vesselModelNode])
+    self._vesselVolumeNode = None
+    self._vesselModelNode = None
 
   def _updateLevelSetParameters(self):
     """
@@ -654,8 +656,10 @@ class VesselWidget(VerticalLayoutWidget):
     if self._vesselVolumeNode is None or self._vesselModelNode is None:
       return
 
-    self._vesselVolumeNode.SetDisplayVisibility(isVisible)
-    self._vesselModelNode.SetDisplayVisibility(isVisible)
+    # Only modify the display nodes whose visibility changes to avoid triggering unnecessary renders
+    for node in [self._vesselVolumeNode, self._vesselModelNode]:
+      if bool(node.GetDisplayVisibility()) != bool(isVisible):
+        node.SetDisplayVisibility(isVisible)
 
     def show_label_in_2d_views():
       slicer.util.setSliceViewerLayers(label=self._vesselVolumeNode if isVisible else None)
@@ -672,9 +676,12 @@ class VesselWidget(VerticalLayoutWidget):
 
   def _updateVisibility(self):
     self._vesselBranchWidget.enableShortcuts(self.visible)
-    self._vesselBranchWidget.setVisibleInScene(self.visible)
-    self._setExtractedVolumeVisible(self.visible)
-    self._setVesselnessVisible(self._showVesselness if self.visible else False)
+
+    # Pause rendering to refresh the views only once after all the display modifications
+    with slicer.util.RenderBlocker():
+      self._vesselBranchWidget.setVisibleInScene(self.visible)
+      self._setExtractedVolumeVisible(self.visible)
+      self._setVesselnessVisible(self._showVesselness if self.visible else False)
 
   def getVesselWizard(self):
     return self._vesselBranchWidget.getVesselWizard()
@@ -4,7 +4,7 @@ from .RVXLiverSegmentationUtils import GeometryExporter, Settings, WidgetUtils,
   getFiducialPositions, createModelNode, createLabelMapVolumeNodeBasedOnModel, createFiducialNode, addToScene, \
   raiseValueErrorIfInvalidType, removeNoneList, Icons, Signal, createDisplayNodeIfNecessary, \
   createVolumeNodeBasedOnModel, removeNodeFromMRMLScene, cropSourceVolume, cloneSourceVolume, \
-  getVolumeIJKToRASDirectionMatrixAsNumpyArray, arrayFromVTKMatrix, resourcesPath
+  getVolumeIJKToRASDirectionMatrixAsNumpyArray, arrayFromVTKMatrix, resourcesPath, mrmlBatchProcessing
 from .VerticalLayoutWidget import VerticalLayoutWidget
 from .DataWidget import DataWidget
 from .SegmentWidget import SegmentWidget
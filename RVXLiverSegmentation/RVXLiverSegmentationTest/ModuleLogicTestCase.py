@@ -3,8 +3,10 @@ import unittest
 
 import numpy as np
 import slicer
+import vtk
 
-from RVXLiverSegmentationLib import RVXLiverSegmentationLogic, GeometryExporter, getVolumeIJKToRASDirectionMatrixAsNumpyArray
+from RVXLiverSegmentationLib import RVXLiverSegmentationLogic, GeometryExporter, SegmentWidget, \
+  getVolumeIJKToRASDirectionMatrixAsNumpyArray
 from .TestUtils import TemporaryDir, createNonEmptyVolume, createNonEmptyModel
 
 
@@ -80,7 +82,7 @@ class RVXLiverSegmentationTestCase(unittest.TestCase):
     with self.assertRaises(ValueError):
       logic.centerLineFilter(None, None)
 
-  def testGeometryExporterSavesVolumesAsNiftiAndModelsAsVtkFiles(self):
+  def testGeometryExporterSavesVolumesAsCompressedNiftiAndModelsAsVtpFiles(self):
     # Create non empty model and volume nodes (empty nodes are not exported)
     model = createNonEmptyModel()
     volume = createNonEmptyVolume()
@@ -99,13 +101,122 @@ class RVXLiverSegmentationTestCase(unittest.TestCase):
       exporter.exportToDirectory(outputDir)
 
       # Expect the nodes have been correctly exported
-      expModelPath = os.path.join(outputDir, "ModelFileName.vtk")
-      expVolumePath = os.path.join(outputDir, "VolumeFileName.nii")
+      expModelPath = os.path.join(outputDir, "ModelFileName.vtp")
+      expVolumePath = os.path.join(outputDir, "VolumeFileName.nii.gz")
       expMarkupPath = os.path.join(outputDir, "MarkupFileName.fcsv")
       self.assertTrue(os.path.isfile(expModelPath))
       self.assertTrue(os.path.isfile(expVolumePath))
       self.assertTrue(os.path.isfile(expMarkupPath))
 
+  def createSegmentWidgetWithNonEmptySegment(self):
+    volume = createNonEmptyVolume()
+    segmentWidget = SegmentWidget("Test Segment", "TestSegmentNode", ["TestSegment"])
+    segmentWidget.setInputNode(volume)
+    segmentWidget.getGeometryExporters()
+
+    # Fill segment with half of the volume
+    segmentNode = slicer.mrmlScene.GetFirstNodeByName("TestSegmentNode")
+    segmentNode.CreateDefaultDisplayNodes()
+    segmentId = segmentNode.GetSegmentation().GetNthSegmentID(0)
+    segmentArray = (slicer.util.arrayFromVolume(volume) > 200).astype(np.uint8)
+    slicer.util.updateSegmentBinaryLabelmapFromArray(segmentArray, segmentNode, segmentId, volume)
+    return segmentWidget, segmentNode, segmentId, volume
+
+  def testSegmentWidgetExportReusesExportedNodesWhenSegmentationIsNotModified(self):
+    segmentWidget, _, _, _ = self.createSegmentWidgetWithNonEmptySegment()
+    exporter = segmentWidget.getGeometryExporters()[0]
+    self.assertIs(exporter, segmentWidget.getGeometryExporters()[0])
+
+  def testSegmentWidgetExportIsUpdatedWhenSegmentIsEdited(self):
+    segmentWidget, segmentNode, segmentId, volume = self.createSegmentWidgetWithNonEmptySegment()
+    exporter = segmentWidget.getGeometryExporters()[0]
+
+    segmentArray = (slicer.util.arrayFromVolume(volume) > 100).astype(np.uint8)
+    slicer.util.updateSegmentBinaryLabelmapFromArray(segmentArray, segmentNode, segmentId, volume)
+    self.assertIsNot(exporter, segmentWidget.getGeometryExporters()[0])
+
+  def testSegmentWidgetExportIsUpdatedWhenSegmentVisibilityChanges(self):
+    segmentWidget, segmentNode, segmentId, _ = self.createSegmentWidgetWithNonEmptySegment()
+    exporter = segmentWidget.getGeometryExporters()[0]
+
+    segmentNode.GetDisplayNode().SetSegmentVisibility(segmentId, False)
+    self.assertIsNot(exporter, segmentWidget.getGeometryExporters()[0])
+
+  def testSegmentWidgetExportIsUpdatedWhenExportedNodesAreRemovedFromScene(self):
+    segmentWidget, _, _, _ = self.createSegmentWidgetWithNonEmptySegment()
+    exporter = segmentWidget.getGeometryExporters()[0]
+
+    slicer.mrmlScene.RemoveNode(slicer.mrmlScene.GetFirstNodeByName("TestSegmentNodeVolume"))
+    self.assertIsNot(exporter, segmentWidget.getGeometryExporters()[0])
+
+  @staticmethod
+  def createCenterLineModel(numberOfPoints=101):
+    # Straight center line along the x axis with one point every mm, a radius point array and a centerline id cell array
+    points = vtk.vtkPoints()
+    radius = vtk.vtkDoubleArray()
+    radius.SetName("Radius")
+    for i in range(numberOfPoints):
+      points.InsertNextPoint(i, 0, 0)
+      radius.InsertNextValue(2.0)
+
+    line = vtk.vtkPolyLine()
+    line.GetPointIds().SetNumberOfIds(numberOfPoints)
+    for i in range(numberOfPoints):
+      line.GetPointIds().SetId(i, i)
+    lines = vtk.vtkCellArray()
+    lines.InsertNextCell(line)
+
+    centerLineIds = vtk.vtkIntArray()
+    centerLineIds.SetName("CenterlineIds")
+    centerLineIds.InsertNextValue(0)
+
+    polyData = vtk.vtkPolyData()
+    polyData.SetPoints(points)
+    polyData.SetLines(lines)
+    polyData.GetPointData().AddArray(radius)
+    polyData.GetCellData().AddArray(centerLineIds)
+
+    centerLineModel = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLModelNode")
+    centerLineModel.SetAndObservePolyData(polyData)
+    return centerLineModel
+
+  def testResampledCenterLineHasFewerPointsAndKeepsItsDataArrays(self):
+    centerLineModel = self.createCenterLineModel()
+    RVXLiverSegmentationLogic.resampleCenterLine(centerLineModel, 10)
+
+    polyData = centerLineModel.GetPolyData()
+    self.assertLess(polyData.GetNumberOfPoints(), 101)
+    self.assertGreater(polyData.GetNumberOfPoints(), 1)
+    self.assertEqual(1, polyData.GetNumberOfLines())
+
+    radius = polyData.GetPointData().GetArray("Radius")
+    self.assertIsNotNone(radius)
+    self.assertEqual(polyData.GetNumberOfPoints(), radius.GetNumberOfTuples())
+    self.assertEqual((2.0, 2.0), radius.GetRange())
+
+    centerLineIds = polyData.GetCellData().GetArray("CenterlineIds")
+    self.assertIsNotNone(centerLineIds)
+    self.assertEqual(1, centerLineIds.GetNumberOfTuples())
+
+  def testResamplingCenterLineWithNonPositiveLengthDoesNothing(self):
+    centerLineModel = self.createCenterLineModel()
+    polyData = centerLineModel.GetPolyData()
+    RVXLiverSegmentationLogic.resampleCenterLine(centerLineModel, 0)
+    RVXLiverSegmentationLogic.resampleCenterLine(centerLineModel, -1)
+
+    self.assertIs(polyData, centerLineModel.GetPolyData())
+    self.assertEqual(101, polyData.GetNumberOfPoints())
+
+  def testResamplingEmptyCenterLineDoesNothing(self):
+    centerLineModel = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLModelNode")
+    RVXLiverSegmentationLogic.resampleCenterLine(centerLineModel, 10)
+    self.assertIsNone(centerLineModel.GetPolyData())
+
+    polyData = vtk.vtkPolyData()
+    centerLineModel.SetAndObservePolyData(polyData)
+    RVXLiverSegmentationLogic.resampleCenterLine(centerLineModel, 10)
+    self.assertIs(polyData, centerLineModel.GetPolyData())
+
   def testGivenNoMinExtentRoiExtentReachesExtremeNodePositions(self):
     node_positions = [[1, 0, 0], [1, 0, 0], [1, 0, 0], [40, 0, 0], [-1, 0, 0]]
 
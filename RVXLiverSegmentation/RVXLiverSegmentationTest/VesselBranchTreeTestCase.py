@@ -519,6 +519,33 @@ class VesselBranchTreeTestCase(unittest.TestCase):
 
     self.assertEqual(treeSort(expTree), treeSort(branchWidget.getTreeParentList()))
 
+  def testWhenReorderingTreeFormerRootsAreExpanded(self):
+    # Before Tree
+    # ParentId
+    #     |_ Child2Id
+    # Child1Id
+    #
+    # After Tree
+    # Child1Id
+    #     |_ ParentId
+    #           |_Child2Id
+
+    # Create before tree by moving child item to the top level as done when dropping items
+    branchWidget = VesselBranchTree(VesselHelpWidget(VesselHelpType.Portal))
+    branchWidget.insertAfterNode("ParentId", None)
+    branchWidget.insertAfterNode("Child1Id", "ParentId")
+    branchWidget.insertAfterNode("Child2Id", "ParentId")
+    branchWidget.addTopLevelItem(branchWidget.getTreeWidgetItem("ParentId").takeChild(0))
+    branchWidget.collapseAll()
+
+    # Enforce one root
+    branchWidget.enforceOneRoot()
+
+    # Verify every former root is expanded
+    self.assertEqual("Child1Id", branchWidget.getRootNodeId())
+    self.assertTrue(branchWidget.getTreeWidgetItem("Child1Id").isExpanded())
+    self.assertTrue(branchWidget.getTreeWidgetItem("ParentId").isExpanded())
+
   def testWhenReorderingEmptyTreeDoesNothing(self):
     # Create empty tree
     branchWidget = VesselBranchTree(VesselHelpWidget(VesselHelpType.Portal))
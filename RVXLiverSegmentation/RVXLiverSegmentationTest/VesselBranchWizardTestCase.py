@@ -1,6 +1,7 @@
 import qt
 import slicer
 import unittest
+import vtk
 
 from RVXLiverSegmentationLib import VesselBranchTree, VesselBranchWizard, VeinId, VesselTreeColumnRole, \
   setup_portal_vein_default_branch, MarkupNode, TreeDrawer, INodePlaceWidget, InteractionStatus, VesselHelpWidget, \
@@ -69,6 +70,36 @@ class VesselBranchWizardTestCase(unittest.TestCase):
   def click_second_element(self):
     self.tree.itemClicked.emit(self.tree.getTreeWidgetItem(VeinId.rightPortalVein), 0)
 
+  def get_tree_line_model(self):
+    return slicer.mrmlScene.GetFirstNodeByName("VesselBranchNodeTree")
+
+  def use_tree_drawer_lines(self):
+    # Restore the tree line update mocked in setUp
+    del self.treeDrawer.updateTreeLines
+    self.treeDrawer.updateTreeLines()
+    return self.get_tree_line_model().GetPolyData()
+
+  def place_first_three_elements(self):
+    # Places portal vein, right portal vein and anterior branch at distinct positions
+    self.click_first_element()
+    for i in range(3):
+      self.nodePlace.placeNode()
+      self.markupNode.SetNthControlPointPosition(i, i, 2 * i, 3 * i)
+
+  @staticmethod
+  def get_tree_line_segments(lineData):
+    segments = []
+    lines = lineData.GetLines()
+    pointIds = vtk.vtkIdList()
+    lines.InitTraversal()
+    while lines.GetNextCell(pointIds):
+      segments.append([pointIds.GetId(i) for i in range(pointIds.GetNumberOfIds())])
+    return sorted(segments)
+
+  @staticmethod
+  def get_tree_line_points(lineData):
+    return [lineData.GetPoint(i) for i in range(lineData.GetNumberOfPoints())]
+
   def get_first_element_text(self):
     return self.tree.getText(VeinId.portalVein)
 
@@ -267,3 +298,91 @@ class VesselBranchWizardTestCase(unittest.TestCase):
   def assertNTimesInTree(self, veinId, ntimes):
     nodeIds = filter(lambda x: veinId in x, self.tree.getNodeList())
     self.assertEqual(ntimes, len(list(nodeIds)))
+
+  def test_tree_drawer_clear_keeps_last_set_line_width_and_opacity(self):
+    self.treeDrawer.setLineWidth(7)
+    self.treeDrawer.setOpacity(0.5)
+    self.treeDrawer.clear()
+
+    lineDisplayNode = slicer.mrmlScene.GetFirstNodeByName("VesselBranchNodeTree").GetDisplayNode()
+    self.assertEqual(7, lineDisplayNode.GetLineWidth())
+    self.assertAlmostEqual(0.5, lineDisplayNode.GetOpacity())
+    self.assertEqual((1, 0, 0), tuple(lineDisplayNode.GetColor()))
+
+  def test_tree_lines_are_updated_when_shown_after_being_hidden_by_the_drawer(self):
+    lineData = self.use_tree_drawer_lines()
+    self.treeDrawer.setVisible(False)
+    self.click_first_element()
+    self.nodePlace.placeNode()
+    self.nodePlace.placeNode()
+    self.assertEqual(0, lineData.GetNumberOfLines())
+
+    self.treeDrawer.setVisible(True)
+    self.assertEqual(2, lineData.GetNumberOfPoints())
+    self.assertEqual(1, lineData.GetNumberOfLines())
+
+  def test_tree_lines_are_updated_when_line_model_is_hidden_outside_of_the_drawer(self):
+    lineData = self.use_tree_drawer_lines()
+    self.get_tree_line_model().SetDisplayVisibility(False)
+    self.click_first_element()
+    self.nodePlace.placeNode()
+    self.nodePlace.placeNode()
+    self.get_tree_line_model().SetDisplayVisibility(True)
+
+    self.assertEqual(2, lineData.GetNumberOfPoints())
+    self.assertEqual(1, lineData.GetNumberOfLines())
+
+  def test_tree_lines_connect_placed_nodes_to_their_closest_placed_ancestor(self):
+    lineData = self.use_tree_drawer_lines()
+
+    # Place portal vein and anterior branch but not right portal vein in between
+    self.click_first_element()
+    self.nodePlace.placeNode()
+    self.tree.itemClicked.emit(self.tree.getTreeWidgetItem(VeinId.anteriorBranch), 0)
+    self.nodePlace.placeNode()
+    self.markupNode.SetNthControlPointPosition(1, 1, 2, 3)
+    self.treeDrawer.updateTreeLines()
+
+    self.assertEqual(VeinId.anteriorBranch, self.markupNode.GetNthControlPointLabel(1))
+    self.assertEqual([(0, 0, 0), (1, 2, 3)], self.get_tree_line_points(lineData))
+    self.assertEqual([[0, 1]], self.get_tree_line_segments(lineData))
+
+  def test_tree_lines_only_move_the_dragged_point(self):
+    lineData = self.use_tree_drawer_lines()
+    self.place_first_three_elements()
+    self.treeDrawer.updateTreeLines()
+    self.assertEqual([[0, 1], [1, 2]], self.get_tree_line_segments(lineData))
+
+    lines = lineData.GetLines()
+    self.markupNode.SetNthControlPointPosition(1, 5, 6, 7)
+    self.treeDrawer.updateNodePosition(1)
+
+    self.assertEqual([(0, 0, 0), (5, 6, 7), (2, 4, 6)], self.get_tree_line_points(lineData))
+    self.assertEqual([[0, 1], [1, 2]], self.get_tree_line_segments(lineData))
+    self.assertIs(lines, lineData.GetLines())
+
+  def test_tree_lines_are_rebuilt_when_a_point_is_renamed(self):
+    lineData = self.use_tree_drawer_lines()
+    self.place_first_three_elements()
+    self.treeDrawer.updateTreeLines()
+
+    # Right portal vein is not in the markup anymore and anterior branch connects to the portal vein
+    lines = lineData.GetLines()
+    self.markupNode.SetNthControlPointLabel(1, "RenamedNode")
+    self.treeDrawer.updateNodePosition(1)
+
+    self.assertIsNot(lines, lineData.GetLines())
+    self.assertEqual([[0, 2]], self.get_tree_line_segments(lineData))
+
+  def test_tree_lines_dont_connect_points_removed_from_the_tree(self):
+    lineData = self.use_tree_drawer_lines()
+    self.place_first_three_elements()
+    self.tree.itemClicked.emit(self.tree.getTreeWidgetItem(VeinId.rightPortalVein), VesselTreeColumnRole.DELETE)
+    self.assertEqual([[0, 2]], self.get_tree_line_segments(lineData))
+
+    # Moving the removed point doesn't modify the lines
+    self.markupNode.SetNthControlPointPosition(1, 5, 6, 7)
+    self.treeDrawer.updateNodePosition(1)
+
+    self.assertEqual([(0, 0, 0), (1, 2, 3), (2, 4, 6)], self.get_tree_line_points(lineData))
+    self.assertEqual([[0, 2]], self.get_tree_line_segments(lineData))